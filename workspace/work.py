@@ -1,52 +1,164 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import datetime
+import hashlib
+import io
+import mmap
 import os
 import pathlib
 import random
+import selectors
 import sys
-import time
 import threading
+import time
 import gpiod
 import gpiodevice
+import numpy
 from gpiod.line import Bias, Direction, Value, Edge
 
-from PIL import Image
+import PIL
+from PIL import Image, features
 
 from inky.auto import auto
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    _tj = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # PyTurboJPEG or the libturbojpeg shared library is missing,
+    # fall back to decoding everything with PIL
+    _tj = None
+
 synologyInkyPath = "/mnt/synology/inky"
 
-# Global variables for LED blinking control
-led_blinking = False
-led_blink_thread = None
+parser = argparse.ArgumentParser()
+
+parser.add_argument("--saturation", "-s", type=float, default=0.5, help="Colour palette saturation")
+parser.add_argument("--file", "-f", type=pathlib.Path, help="Image file")
+
+args, _ = parser.parse_known_args()
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp"}
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+
+# Decoded and resized images, ready for inky.set_image
+CACHE_DIR = os.path.expanduser("~/.cache/inky")
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Age in seconds after which a leftover cache temporary file is deleted
+CACHE_TMP_MAX_AGE = 60
+
+# How long a directory listing is trusted before re-reading it, in seconds
+LISTING_TTL = 30
+
+# Cached image listing, invalidated on expiry or when the folder mtime changes
+_listing_cache = {"folder": None, "mtime": 0, "entries": [], "expiry": 0}
+
+# The LED is blinked in-kernel by the "timer" trigger when GPIO13 is bound to
+# the leds-gpio driver and its attributes are writable, see README.md
+LED_SYSFS = "/sys/class/leds/inky-led"
+LED_BLINK_MS = 500
+
+# Presses arriving within this many seconds of a finished refresh are ignored,
+# this drops presses that queued up while the panel was busy updating
+MIN_REFRESH_SEC = 5
+
+LED_PIN = 13
+
+SW_A = 5
+SW_B = 6
+SW_C = 25
+SW_D = 24
+
+BUTTONS = [SW_A, SW_B, SW_C, SW_D]
+
+# These correspond to buttons A, B, C and D respectively
+LABELS = ["A", "B", "C", "D"]
+
+# Find the gpiochip device we need once, we'll use
+# gpiodevice for this, since it knows the right device
+# for its supported platforms.
+_CHIP = gpiodevice.find_chip_by_platform()
+
+# Line offsets on _CHIP for the LED and each button
+LED_OFFSET = _CHIP.line_offset_from_id(LED_PIN)
+OFFSETS = [_CHIP.line_offset_from_id(id) for id in BUTTONS]
+
+# Serializes cache eviction between the main thread and the prefetch worker
+_cache_lock = threading.Lock()
+
+# Decodes likely next images into the cache while the panel is refreshing
+_prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+# Random image picked and cached by the prefetch worker for the next "A" press
+_next_random_image = None
+
+# Global variables for LED control
+led_sysfs = None
 led_gpio_request = None
 led_line_offset = None
 
-def get_all_image_files(folder=synologyInkyPath):
+def report_imaging_backend():
     """
-    Returns a list of all image file paths from the specified folder.
-    
+    Log the Pillow build and whether JPEG decoding goes through libjpeg-turbo.
+
+    Returns:
+        True if Pillow reports libjpeg-turbo support, otherwise False
+    """
+    turbo = bool(features.check_feature("libjpeg_turbo"))
+    print(f"Pillow {PIL.__version__}, libjpeg {features.version('jpg')}, libjpeg-turbo: {'yes' if turbo else 'no'}")
+    if not turbo:
+        print("Warning: Pillow is not using libjpeg-turbo, JPEG decoding will be slow. See workspace/README.md")
+    return turbo
+
+def _iter_images(folder):
+    """Yield os.DirEntry objects for the image files in folder, in one directory pass."""
+    with os.scandir(folder) as it:
+        for e in it:
+            # is_file() uses the d_type from readdir, so this needs no extra stat
+            if e.is_file() and os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS:
+                yield e
+
+def _get_cached_entries(folder):
+    """Return the cached listing for folder if it is still valid, otherwise None."""
+    if (_listing_cache["folder"] == folder
+            and time.time() < _listing_cache["expiry"]
+            and os.stat(folder).st_mtime == _listing_cache["mtime"]):
+        return _listing_cache["entries"]
+    return None
+
+def get_image_entries(folder=synologyInkyPath):
+    """
+    Returns os.DirEntry objects for all image files in the specified folder.
+
+    The listing is cached for LISTING_TTL seconds and re-read early if the
+    folder's mtime changes, avoiding a readdir over NFS on every button press.
+    DirEntry objects also keep their stat() result, so mtimes are fetched once.
+
     Args:
         folder: Path to the folder containing images
-        
+
     Returns:
-        List of full paths to all image files
-        
+        List of os.DirEntry objects for all image files
+
     Raises:
         ValueError: If no valid image files are found in the folder
     """
-    # Define supported image extensions
-    image_extensions = (".jpg", ".jpeg", ".png", ".gif", ".bmp")
-    
-    # Get all image files from the folder
-    image_files = [f for f in os.listdir(folder) if f.lower().endswith(image_extensions)]
-    
-    if not image_files:
+    entries = _get_cached_entries(folder)
+    if entries is not None:
+        return entries
+
+    st = os.stat(folder)
+    entries = list(_iter_images(folder))
+
+    if not entries:
         raise ValueError(f"No image files found in {folder}")
-    
-    # Return full paths
-    return [os.path.join(folder, f) for f in image_files]
+
+    _listing_cache.update(folder=folder, mtime=st.st_mtime, entries=entries, expiry=time.time() + LISTING_TTL)
+
+    return entries
 
 def get_random_image_path(folder=synologyInkyPath):
     """
@@ -61,8 +173,20 @@ def get_random_image_path(folder=synologyInkyPath):
     Raises:
         ValueError: If no valid image files are found in the folder
     """
-    all_images = get_all_image_files(folder)
-    return random.choice(all_images)
+    entries = _get_cached_entries(folder)
+    if entries is not None:
+        return random.choice(entries).path
+
+    # Reservoir sample a single entry, rather than building the whole listing
+    pick = None
+    for i, entry in enumerate(_iter_images(folder), start=1):
+        if random.random() < 1.0 / i:
+            pick = entry
+
+    if pick is None:
+        raise ValueError(f"No image files found in {folder}")
+
+    return pick.path
 
 def get_latest_image_path(folder=synologyInkyPath):
     """
@@ -77,12 +201,86 @@ def get_latest_image_path(folder=synologyInkyPath):
     Raises:
         ValueError: If no valid image files are found in the folder
     """
-    all_images = get_all_image_files(folder)
+    all_images = get_image_entries(folder)
     
-    # Sort by modification time (most recent first)
-    latest_image = max(all_images, key=os.path.getmtime)
+    # Pick the most recently modified, using each entry's cached stat
+    latest_image = max(all_images, key=lambda e: e.stat().st_mtime)
     
-    return latest_image
+    return latest_image.path
+
+def decode_jpeg(buf, target_size=None):
+    """
+    Decode JPEG data to an RGB array with TurboJPEG.
+
+    Args:
+        buf: JPEG file contents
+        target_size: Optional tuple of (width, height) the image will be fitted to
+
+    Returns:
+        uint8 numpy array of shape (height, width, 3)
+    """
+    scale = (1, 1)
+    if target_size is not None:
+        width, height, _, _ = _tj.decode_header(buf)
+        scale = get_jpeg_scale((width, height), target_size)
+    return _tj.decode(buf, scaling_factor=scale, pixel_format=TJPF_RGB)
+
+def load_image(file, target_size=None):
+    """
+    Open an image file, decoding JPEGs directly with TurboJPEG when available.
+
+    When target_size is given, JPEGs are decoded at the smallest DCT scale
+    (1/8, 1/4, 1/2 or 1/1) that still covers the aspect-fit size, so the
+    final LANCZOS resize works from a much smaller image.
+
+    Args:
+        file: Path to the image file
+        target_size: Optional tuple of (width, height) the image will be fitted to
+
+    Returns:
+        PIL Image object
+    """
+    is_jpeg = str(file).lower().endswith(JPEG_EXTENSIONS)
+
+    # Read once, so a TurboJPEG failure can fall back to PIL without another NFS read
+    with open(file, "rb") as f:
+        buf = f.read()
+
+    if _tj is not None and is_jpeg:
+        try:
+            return Image.fromarray(decode_jpeg(buf, target_size), "RGB")
+        except OSError as e:
+            # CMYK JPEGs, or other formats with a .jpg name, are left to PIL
+            print(f"TurboJPEG could not decode {file}, falling back to PIL: {e}")
+
+    image = Image.open(io.BytesIO(buf))
+    if is_jpeg and target_size is not None:
+        # PIL's equivalent of a scaled IDCT decode
+        num, den = get_jpeg_scale(image.size, target_size)
+        image.draft("RGB", (-(-image.width * num // den), -(-image.height * num // den)))
+    return image
+
+def get_jpeg_scale(size, target_size):
+    """
+    Pick the smallest JPEG DCT scaling factor that still fits target_size.
+
+    Args:
+        size: Tuple of (width, height) of the full resolution JPEG
+        target_size: Tuple of (width, height) for the target display size
+
+    Returns:
+        Tuple of (numerator, denominator)
+    """
+    width, height = size
+    target_width, target_height = target_size
+
+    # The aspect-fit resize scales by the tighter of the two ratios
+    ratio = min(target_width / width, target_height / height)
+
+    for num, den in ((1, 8), (1, 4), (1, 2)):
+        if num / den >= ratio:
+            return num, den
+    return 1, 1
 
 def resize_image_aspect_fit(image, target_size, background_color="white"):
     """
@@ -128,76 +326,285 @@ def resize_image_aspect_fit(image, target_size, background_color="white"):
     
     return result
 
+def get_cache_path(file, mtime_ns, resolution, saturation):
+    """
+    Returns the cache file path for an image rendered for a given display.
+
+    Args:
+        file: Path to the source image file
+        mtime_ns: Modification time of the source image file, from os.stat
+        resolution: Tuple of (width, height) of the display
+        saturation: Colour palette saturation
+
+    Returns:
+        Path to the raw .bin cache entry (which may not exist yet)
+    """
+    key = f"{os.path.abspath(file)}|{mtime_ns}|{resolution[0]}x{resolution[1]}|{saturation}"
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".bin")
+
+def load_cached_image(inky, cache_path):
+    """
+    Load a previously rendered image from the cache.
+
+    Args:
+        inky: Inky display instance
+        cache_path: Path returned by get_cache_path
+
+    Returns:
+        PIL Image object, or None if the image is not cached
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Mark as recently used, atime is unreliable with relatime/noatime mounts
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        return None
+
+    width, height = inky.resolution
+
+    # Six colour displays cache palette indices, others cache RGB.
+    # "P" images map the file directly, pages are read in from the page cache on use.
+    if len(data) == width * height:
+        image = Image.frombuffer("P", (width, height), data, "raw", "P", 0, 1)
+        _set_display_palette(inky, image)
+        return image
+    if len(data) == width * height * 3:
+        return Image.frombuffer("RGB", (width, height), data, "raw", "RGB", 0, 1)
+
+    data.close()
+    return None
+
+def save_cached_image(cache_path, image):
+    """
+    Store a rendered image in the cache and evict old entries if over budget.
+
+    The cache is only an optimisation, so failures are logged and otherwise ignored.
+
+    Args:
+        cache_path: Path returned by get_cache_path
+        image: PIL Image object sized for the display, "P" images are stored as palette indices
+    """
+    # Write to a temporary file first so a partial entry is never loaded
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write((image if image.mode == "P" else image.convert("RGB")).tobytes())
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Unable to write cache entry {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+
+    try:
+        with _cache_lock:
+            prune_cache()
+    except OSError as e:
+        print(f"Unable to prune cache: {e}")
+
+def prune_cache(max_bytes=CACHE_MAX_BYTES):
+    """
+    Delete the least recently used cache entries until the cache fits max_bytes.
+
+    Temporary files left behind by an interrupted save_cached_image are deleted
+    once they are older than CACHE_TMP_MAX_AGE seconds.
+
+    Args:
+        max_bytes: Cache size budget in bytes
+    """
+    stale_before = time.time() - CACHE_TMP_MAX_AGE
+
+    with os.scandir(CACHE_DIR) as it:
+        entries = [(e.stat(), e.path) for e in it
+                   if e.is_file() and e.name.endswith((".bin", ".npy", ".tmp"))]
+
+    # In-progress writes aren't ours to delete, stale ones go first regardless of budget
+    entries = [(st, path) for st, path in entries if not path.endswith(".tmp") or st.st_mtime < stale_before]
+    total = sum(st.st_size for st, _ in entries)
+
+    for st, path in sorted(entries, key=lambda entry: (not entry[1].endswith(".tmp"), entry[0].st_atime)):
+        if total <= max_bytes and not path.endswith(".tmp"):
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= st.st_size
+
+def _set_display_palette(inky, image):
+    """Label a "P" image's indices with the pure colours set_image expects."""
+    image.putpalette(numpy.array(inky.DESATURATED_PALETTE[:6], dtype=numpy.uint8).flatten().tobytes())
+
+def dither_image(inky, image, saturation):
+    """
+    Dither an image to the display's six colour palette.
+
+    Only used for the six colour (Spectra 6) displays, whose set_image passes
+    a six colour palette image through without dithering it again.
+
+    Args:
+        inky: Inky display instance
+        image: PIL Image object sized for the display
+        saturation: Colour palette saturation
+
+    Returns:
+        PIL Image object in "P" mode, or None if the display doesn't support it
+    """
+    if not hasattr(inky, "_palette_blend"):
+        return None
+
+    palette = inky._palette_blend(saturation)
+    if len(palette) != 6 * 3:
+        return None
+
+    # Image size doesn't matter since it's just the palette we're using
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(palette)
+    result = image.convert("RGB").quantize(6, palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG)
+
+    # Relabel the indices with the pure colours set_image expects
+    _set_display_palette(inky, result)
+    return result
+
+def render_image(inky, file, saturation):
+    """
+    Decode, resize and quantize an image for the display, using the cache when possible.
+
+    Images are reduced to palette indices straight after resizing, so the cache
+    and set_image handle one byte per pixel instead of three.
+
+    Args:
+        inky: Inky display instance
+        file: Path to the image file
+        saturation: Colour palette saturation
+
+    Returns:
+        PIL Image object sized for the display, in "P" mode for six colour displays
+    """
+    # Stat the file once, a cache miss then only adds the read in load_image
+    mtime_ns = os.stat(file).st_mtime_ns
+    cache_path = get_cache_path(file, mtime_ns, inky.resolution, saturation)
+    rendered_image = load_cached_image(inky, cache_path)
+
+    if rendered_image is None:
+        image = load_image(file, inky.resolution)
+        rendered_image = resize_image_aspect_fit(image, inky.resolution)
+        dithered_image = dither_image(inky, rendered_image, saturation)
+        if dithered_image is not None:
+            rendered_image = dithered_image
+        save_cached_image(cache_path, rendered_image)
+    else:
+        print(f"Using cached image for {file}")
+
+    return rendered_image
+
+def prefetch_images(inky, saturation):
+    """
+    Render the latest and a random image into the cache ahead of the next press.
+
+    Runs on the prefetch worker, while the main thread waits for the panel refresh.
+
+    Args:
+        inky: Inky display instance
+        saturation: Colour palette saturation
+    """
+    global _next_random_image
+
+    try:
+        render_image(inky, get_latest_image_path(), saturation)
+
+        random_image = get_random_image_path()
+        render_image(inky, random_image, saturation)
+        _next_random_image = random_image
+    except Exception as e:  # noqa: BLE001
+        # Nothing inspects the Future, so log here rather than lose the error
+        print(f"Prefetch failed: {e!r}")
+
+def take_next_random_image_path():
+    """
+    Returns the random image prefetched for the next press, or picks a new one.
+
+    Returns:
+        Full path to a randomly selected image file
+    """
+    global _next_random_image
+
+    random_image, _next_random_image = _next_random_image, None
+    if random_image is not None and os.path.exists(random_image):
+        return random_image
+    return get_random_image_path()
+
 def setup_led():
-    """Setup the LED GPIO pin and return the gpio request and line offset."""
-    global led_gpio_request, led_line_offset
-    
-    LED_PIN = 13
-    chip = gpiodevice.find_chip_by_platform()
-    led_line_offset = chip.line_offset_from_id(LED_PIN)
-    led_gpio_request = chip.request_lines(
-        consumer="inky-led", 
-        config={led_line_offset: gpiod.LineSettings(direction=Direction.OUTPUT, bias=Bias.DISABLED)}
-    )
-    return led_gpio_request, led_line_offset
+    """
+    Setup the LED, preferring the kernel LED class device over a raw GPIO line.
+
+    Returns:
+        Path to the LED class device, or None if falling back to GPIO
+    """
+    global led_sysfs, led_gpio_request, led_line_offset
+
+    if os.path.isdir(LED_SYSFS):
+        # The LED attributes are root-only unless the udev rule from README.md is installed
+        if all(os.access(os.path.join(LED_SYSFS, name), os.W_OK) for name in ("trigger", "brightness")):
+            led_sysfs = LED_SYSFS
+            set_led(False)
+            return led_sysfs
+        print(f"No write access to {LED_SYSFS}, LED will not blink. See workspace/README.md")
+    else:
+        print(f"{LED_SYSFS} not found, LED will not blink. See workspace/README.md")
+
+    try:
+        led_line_offset = LED_OFFSET
+        led_gpio_request = _CHIP.request_lines(
+            consumer="inky-led", 
+            config={led_line_offset: gpiod.LineSettings(direction=Direction.OUTPUT, bias=Bias.DISABLED)}
+        )
+    except OSError as e:
+        # The line is busy if the overlay is loaded but its attributes aren't writable
+        print(f"Unable to request the LED line, LED disabled: {e}")
+        led_gpio_request = None
+    return None
+
+def write_led_attribute(name, value):
+    """Write a value to one of the LED class device's sysfs attributes."""
+    with open(os.path.join(led_sysfs, name), "w") as f:
+        f.write(str(value))
 
 def set_led(state):
-    """Set the LED on or off."""
-    global led_gpio_request, led_line_offset
-    if led_gpio_request and led_line_offset is not None:
+    """Set the LED on or off, cancelling any blinking."""
+    if led_sysfs:
+        write_led_attribute("trigger", "none")
+        write_led_attribute("brightness", 1 if state else 0)
+    elif led_gpio_request and led_line_offset is not None:
         led_gpio_request.set_value(led_line_offset, Value.ACTIVE if state else Value.INACTIVE)
 
-def blink_led_worker():
-    """Worker function that blinks the LED every 500ms."""
-    global led_blinking
-    while led_blinking:
-        set_led(True)
-        time.sleep(0.5)
-        if not led_blinking:  # Check again before turning off
-            break
-        set_led(False)
-        time.sleep(0.5)
-
 def start_led_blinking():
-    """Start the LED blinking in a background thread."""
-    global led_blinking, led_blink_thread
-    
-    if not led_blinking:
-        led_blinking = True
-        led_blink_thread = threading.Thread(target=blink_led_worker, daemon=True)
-        led_blink_thread.start()
+    """Start the LED blinking every 500ms using the kernel timer trigger."""
+    if led_sysfs:
+        write_led_attribute("trigger", "timer")
+        try:
+            write_led_attribute("delay_on", LED_BLINK_MS)
+            write_led_attribute("delay_off", LED_BLINK_MS)
+        except OSError:
+            # The trigger creates these root-only, the kernel default is already 500ms
+            pass
 
 def stop_led_blinking():
     """Stop the LED blinking and turn it off."""
-    global led_blinking, led_blink_thread
-    
-    if led_blinking:
-        led_blinking = False
-        if led_blink_thread:
-            led_blink_thread.join(timeout=1.0)
-        set_led(False)
-
-def enable_led(enable):
-    LED_PIN = 13
-    # Find the gpiochip device we need, we'll use
-    # gpiodevice for this, since it knows the right device
-    # for its supported platforms.
-    chip = gpiodevice.find_chip_by_platform()
-
-    # Setup for the LED pin
-    led = chip.line_offset_from_id(LED_PIN)
-    gpio = chip.request_lines(consumer="inky", config={led: gpiod.LineSettings(direction=Direction.OUTPUT, bias=Bias.DISABLED)})
-
-    if enable:
-        gpio.set_value(led, Value.ACTIVE)
-    else:
-        gpio.set_value(led, Value.INACTIVE)
+    set_led(False)
 
-def show_image(image_path=None):
+def show_image(inky, saturation, image_path=None):
     """
     Display an image on the Inky display.
     
     Args:
+        inky: Inky display instance, set up once by setup_buttons
+        saturation: Colour palette saturation
         image_path: Optional path to image file. If not provided, will check command line args
                     or use a random image.
     """
@@ -205,17 +612,6 @@ def show_image(image_path=None):
     stop_led_blinking()
     set_led(True)
 
-    parser = argparse.ArgumentParser()
-
-    parser.add_argument("--saturation", "-s", type=float, default=0.5, help="Colour palette saturation")
-    parser.add_argument("--file", "-f", type=pathlib.Path, help="Image file")
-
-    inky = auto(ask_user=True, verbose=True)
-
-    args, _ = parser.parse_known_args()
-
-    saturation = args.saturation
-
     # Determine which file to use (priority: function arg > command line arg > random)
     if image_path:
         file = image_path
@@ -227,14 +623,15 @@ def show_image(image_path=None):
 
     print(f"Selected image: {file}")
 
-
-    image = Image.open(file)
-    resized_image = resize_image_aspect_fit(image, inky.resolution)
+    rendered_image = render_image(inky, file, saturation)
 
     try:
-        inky.set_image(resized_image, saturation=saturation)
+        inky.set_image(rendered_image, saturation=saturation)
     except TypeError:
-        inky.set_image(resized_image)
+        inky.set_image(rendered_image)
+
+    # Use the idle CPU during the slow panel refresh to prepare the next images
+    _prefetch_executor.submit(prefetch_images, inky, saturation)
 
     inky.show()
 
@@ -242,54 +639,61 @@ def show_image(image_path=None):
     start_led_blinking()
 
 def setup_buttons():
-    # Setup LED first
-    setup_led()
-    
-    SW_A = 5
-    SW_B = 6
-    SW_C = 25
-    SW_D = 24
+    report_imaging_backend()
 
-    BUTTONS = [SW_A, SW_B, SW_C, SW_D]
+    # Probe the display once, rather than on every button press
+    inky = auto(ask_user=True, verbose=True)
 
-    # These correspond to buttons A, B, C and D respectively
-    LABELS = ["A", "B", "C", "D"]
+    # Setup LED first
+    setup_led()
 
     # Create settings for all the input pins, we want them to be inputs
-    # with a pull-up and a falling edge detection.
-    INPUT = gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP, edge_detection=Edge.FALLING)
-
-    # Find the gpiochip device we need, we'll use
-    # gpiodevice for this, since it knows the right device
-    # for its supported platforms.
-    chip = gpiodevice.find_chip_by_platform()
+    # with a pull-up and a falling edge detection, debounced in the kernel
+    # so a single press only produces one event.
+    INPUT = gpiod.LineSettings(
+        direction=Direction.INPUT,
+        bias=Bias.PULL_UP,
+        edge_detection=Edge.FALLING,
+        debounce_period=datetime.timedelta(milliseconds=20)
+    )
 
     # Build our config for each pin/line we want to use
-    OFFSETS = [chip.line_offset_from_id(id) for id in BUTTONS]
     line_config = dict.fromkeys(OFFSETS, INPUT)
 
     # Request the lines, *whew*
-    request = chip.request_lines(consumer="spectra6-buttons", config=line_config)
+    request = _CHIP.request_lines(consumer="spectra6-buttons", config=line_config)
+
+
+    # Map each line offset straight to its GPIO number and label
+    LUT = {offset: (BUTTONS[i], LABELS[i]) for i, offset in enumerate(OFFSETS)}
 
+    # Monotonic time the last image refresh finished
+    last_show_ts = -MIN_REFRESH_SEC
 
     # "handle_button" will be called every time a button is pressed
     # It receives one argument: the associated gpiod event object.
     def handle_button(event):
-        index = OFFSETS.index(event.line_offset)
-        gpio_number = BUTTONS[index]
-        label = LABELS[index]
+        nonlocal last_show_ts
+
+        gpio_number, label = LUT[event.line_offset]
         print(f"Button press detected on GPIO #{gpio_number} label: {label}")
+
+        if label in ("A", "B") and time.monotonic() - last_show_ts < MIN_REFRESH_SEC:
+            print("Display was just refreshed, ignoring press")
+            return
         
         if label == "A":
             # Button A: Show random image
             print("Fetching random image...")
-            random_image = get_random_image_path()
-            show_image(random_image)
+            random_image = take_next_random_image_path()
+            show_image(inky, args.saturation, random_image)
+            last_show_ts = time.monotonic()
         elif label == "B":
             # Button B: Show latest image
             print("Fetching latest image...")
             latest_image = get_latest_image_path()
-            show_image(latest_image)
+            show_image(inky, args.saturation, latest_image)
+            last_show_ts = time.monotonic()
         elif label == "D":
             # Button D: Shutdown the Raspberry Pi
             print("Shutdown button pressed! Shutting down in 2 seconds...")
@@ -300,13 +704,25 @@ def setup_buttons():
 
     # Start LED blinking while waiting for button presses
     start_led_blinking()
-    print("Ready! LED is blinking.")
+    if led_sysfs:
+        print("Ready! LED is blinking.")
+    else:
+        print("Ready! The LED does not blink while idle, see workspace/README.md to enable it.")
     print("Press button A for random image")
     print("Press button B for latest image.")
     print("Press button D to shutdown the Raspberry Pi.")
 
-    while True:
-        for event in request.read_edge_events():
-           handle_button(event)
+    # Sleep in the kernel until the line request's fd has edge events queued
+    selector = selectors.DefaultSelector()
+    selector.register(request.fd, selectors.EVENT_READ)
+
+    try:
+        while True:
+            selector.select()
+            for event in request.read_edge_events():
+                handle_button(event)
+    finally:
+        selector.close()
+        request.release()
 
 setup_buttons()
\ No newline at end of file